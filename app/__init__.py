@@ -1,9 +1,13 @@
 # app/__init__.py
 import os
+import pandas as pd
 from flask import Flask
 from .config import Config
 
 def create_app():
+    # loader results are cached and shared between requests; copy-on-write keeps slices of them cheap and safe
+    pd.options.mode.copy_on_write = True
+
     app = Flask(__name__, template_folder="templates", static_folder="static")
     app.config.from_object(Config)
     # ensure data dir exists
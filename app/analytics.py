@@ -1,13 +1,173 @@
 # app/analytics.py
+import math
 import pandas as pd
 import numpy as np
 
+try:
+    import numba
+except ImportError:  # numba is optional; kernels below then run as plain Python
+    numba = None
+
+def _pearson_py(x, y):
+    """Two-pass Pearson correlation over equal-length float64 arrays (NaN if undefined)."""
+    n = x.shape[0]
+    if n < 2:
+        return np.nan
+    sx = 0.0
+    sy = 0.0
+    for i in range(n):
+        sx += x[i]
+        sy += y[i]
+    mx = sx / n
+    my = sy / n
+    sxy = 0.0
+    sxx = 0.0
+    syy = 0.0
+    for i in range(n):
+        dx = x[i] - mx
+        dy = y[i] - my
+        sxy += dx * dy
+        sxx += dx * dx
+        syy += dy * dy
+    denom = math.sqrt(sxx * syy)
+    if denom == 0.0:
+        return np.nan
+    return sxy / denom
+
+if numba is not None:
+    from numba import types as _nb
+    # read-only array types accept both writable arrays and the read-only views pandas hands out under copy-on-write
+    _RO_F64 = _nb.Array(_nb.float64, 1, "C", readonly=True)
+    _RO_I32 = _nb.Array(_nb.int32, 1, "C", readonly=True)
+    # explicit signature compiles eagerly at import (and is cached on disk), so requests never pay JIT latency
+    _pearson_kernel = numba.njit(_nb.float64(_RO_F64, _RO_F64), cache=True)(_pearson_py)
+else:
+    _pearson_kernel = _pearson_py
+
+def _pearson(x, y):
+    """Pearson correlation of two aligned series/arrays, dropping pairs with a NaN (like Series.corr)."""
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    y = np.ascontiguousarray(y, dtype=np.float64)
+    ok = ~(np.isnan(x) | np.isnan(y))
+    if not ok.all():
+        x, y = x[ok], y[ok]
+    return float(_pearson_kernel(x, y))
+
+def _crop_totals_py(year, use_year, y_lo, y_hi, state_c, use_state, s_target, crop_c, prod, ncrops):
+    """
+    Single pass over int-coded rows: apply the year/state filters and sum production per crop code.
+    Returns (totals, seen) where seen marks crops with at least one matching row.
+    """
+    out = np.zeros(ncrops, dtype=np.float64)
+    seen = np.zeros(ncrops, dtype=np.bool_)
+    for i in range(crop_c.shape[0]):
+        c = crop_c[i]
+        if c < 0:
+            continue
+        if use_year and not (y_lo <= year[i] <= y_hi):
+            continue
+        if use_state and state_c[i] != s_target:
+            continue
+        p = prod[i]
+        if p == p:
+            out[c] += p
+        seen[c] = True
+    return out, seen
+
+if numba is not None:
+    _crop_totals_kernel = numba.njit(
+        _nb.Tuple((_nb.float64[::1], _nb.boolean[::1]))(
+            _RO_F64, _nb.boolean, _nb.float64, _nb.float64, _RO_I32, _nb.boolean, _nb.int32, _RO_I32, _RO_F64, _nb.int64),
+        cache=True,
+    )(_crop_totals_py)
+else:
+    _crop_totals_kernel = None
+
+def _top_crops_fused(df, year_series, max_year, min_year, state_col, state, crop_col, prod_col):
+    """
+    Fused filter + groupby-sum for categorical crop/state columns (numba only).
+    `year_series` is the already-coerced numeric year (None without a year column).
+    Returns the same (crop, production) frame as the pandas path, or None if not applicable.
+    """
+    if _crop_totals_kernel is None or crop_col not in df.columns or prod_col not in df.columns:
+        return None
+    crop = df[crop_col]
+    if not isinstance(crop.dtype, pd.CategoricalDtype) or not pd.api.types.is_numeric_dtype(df[prod_col]):
+        return None
+    use_state = state_col in df.columns
+    if use_state and not isinstance(df[state_col].dtype, pd.CategoricalDtype):
+        return None
+
+    use_year = bool(max_year) and year_series is not None
+    if use_year:
+        year = np.ascontiguousarray(year_series.to_numpy(dtype=np.float64, na_value=np.nan))
+    else:
+        year = np.empty(0, dtype=np.float64)
+    if use_state:
+        state_cats = df[state_col].cat.categories
+        # -2 never matches a code (-1 is NaN), so an unknown state selects no rows
+        s_target = int(state_cats.get_loc(state)) if state in state_cats else -2
+        state_c = np.ascontiguousarray(df[state_col].cat.codes.to_numpy(), dtype=np.int32)
+    else:
+        s_target = -2
+        state_c = np.empty(0, dtype=np.int32)
+    crop_c = np.ascontiguousarray(crop.cat.codes.to_numpy(), dtype=np.int32)
+    prod = np.ascontiguousarray(df[prod_col].to_numpy(dtype=np.float64, na_value=np.nan))
+
+    cats = crop.cat.categories
+    totals, seen = _crop_totals_kernel(year, use_year, float(min_year or 0), float(max_year or 0),
+                                       state_c, use_state, s_target, crop_c, prod, len(cats))
+    return pd.DataFrame({
+        crop_col: pd.Categorical(cats[seen], categories=cats),
+        prod_col: totals[seen],
+    })
+
 def safe_cast_series(s):
     try:
         return pd.to_numeric(s, errors="coerce")
     except Exception:
         return s
 
+def _numeric_year(s: pd.Series):
+    """Loaders already return an integer `year`; only coerce frames that didn't come through them."""
+    if pd.api.types.is_numeric_dtype(s):
+        return s
+    return pd.to_numeric(s, errors="coerce")
+
+def _isin_mask(s: pd.Series, values):
+    """Boolean ndarray of `s.isin(values)`; categoricals compare integer codes instead of objects."""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        cats = s.cat.categories
+        codes = s.cat.codes.to_numpy()
+        target = np.array([cats.get_loc(v) for v in values if v in cats], dtype=codes.dtype)
+        return np.isin(codes, target)
+    return s.isin(values).to_numpy()
+
+def _ci_equal_mask(s: pd.Series, value: str):
+    """Boolean ndarray of case-insensitive `s == value`; categoricals lowercase only their categories."""
+    value = value.lower()
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        cats = s.cat.categories
+        codes = s.cat.codes.to_numpy()
+        target = np.flatnonzero(cats.astype(str).str.lower() == value).astype(codes.dtype)
+        return np.isin(codes, target)
+    return (s.astype(str).str.lower() == value).to_numpy()
+
+def _col_lut(df: pd.DataFrame):
+    """Map lowercased column name -> original column name (first occurrence wins)."""
+    # loaders precompute this; attrs are carried onto derived frames, so only trust it if the columns still match
+    lut = df.attrs.get("cols_lower")
+    if lut is not None and list(lut.values()) == df.columns.tolist():
+        return lut
+    lut = {}
+    for c in df.columns:
+        lut.setdefault(c.lower(), c)
+    return lut
+
+def _detect_col(lut: dict, candidates):
+    """Return the original name of the first candidate present in `lut`, else None."""
+    return next((lut[c] for c in candidates if c in lut), None)
+
 def avg_annual_climate_metric(df_climate: pd.DataFrame, states: list, year_col_candidates=None, metric_candidates=None, last_n_years=3):
     """
     Compute average annual climate metric (e.g., annual_mean_temp_c) for the given states over last N years.
@@ -15,22 +175,14 @@ def avg_annual_climate_metric(df_climate: pd.DataFrame, states: list, year_col_c
     Returns (df_result, meta)
     """
     # auto-detect year column
-    cols = [c.lower() for c in df_climate.columns]
-    year_col = None
-    for cand in (year_col_candidates or ["year", "yy", "yr"]):
-        if cand in cols:
-            year_col = df_climate.columns[cols.index(cand)]
-            break
+    lut = _col_lut(df_climate)
+    year_col = _detect_col(lut, year_col_candidates or ["year", "yy", "yr"])
     if not year_col:
         raise ValueError("Could not detect year column in climate data")
 
     # metric detection
-    metric_col = None
     possible_metrics = metric_candidates or ["annual_mean_temp_c", "annual_temp", "annual_mean_temp", "annual_rainfall_mm", "rainfall_mm", "mean_temp_c", "annual_mean_temp"]
-    for cand in possible_metrics:
-        if cand in cols:
-            metric_col = df_climate.columns[cols.index(cand)]
-            break
+    metric_col = _detect_col(lut, possible_metrics)
 
     if not metric_col:
         # fallback: pick numeric column other than year and state
@@ -42,50 +194,29 @@ def avg_annual_climate_metric(df_climate: pd.DataFrame, states: list, year_col_c
             raise ValueError("No numeric climate metric found")
 
     # state col detect
-    state_col = None
-    for cand in ["state", "region", "subdivision", "district"]:
-        if cand in cols:
-            state_col = df_climate.columns[cols.index(cand)]
-            break
+    state_col = _detect_col(lut, ["state", "region", "subdivision", "district"])
 
-    max_year = int(pd.to_numeric(df_climate[year_col], errors="coerce").dropna().astype(int).max())
+    years = _numeric_year(df_climate[year_col])
+    max_year = int(years.max())
     min_year = max_year - last_n_years + 1
-    df_climate[year_col] = pd.to_numeric(df_climate[year_col], errors="coerce")
-    df_f = df_climate[(df_climate[year_col] >= min_year) & (df_climate[year_col] <= max_year)]
+    mask = ((years >= min_year) & (years <= max_year)).to_numpy(dtype=bool, na_value=False)
     if state_col:
-        df_f = df_f[df_f[state_col].isin(states)]
-        out = df_f.groupby(state_col)[metric_col].mean().reset_index().rename(columns={metric_col: f"avg_{metric_col}"})
+        mask &= _isin_mask(df_climate[state_col], states)
+    df_f = df_climate[mask]
+    if state_col:
+        out = df_f.groupby(state_col, observed=True)[metric_col].mean().reset_index().rename(columns={metric_col: f"avg_{metric_col}"})
     else:
         out = pd.DataFrame({f"avg_{metric_col}": [df_f[metric_col].mean()]})
     return out, {"years_used": (min_year, max_year), "metric_column": metric_col, "year_column": year_col, "state_column": state_col}
 
 def top_crops_by_volume(df_crop: pd.DataFrame, state: str, last_n_years:int, top_m:int):
     # try to detect standard columns
-    df = df_crop.copy()
-    cols_lower = [c.lower() for c in df.columns]
-    # detect year column
-    year_col = None
-    for cand in ["year", "season", "reporting_year"]:
-        if cand in cols_lower:
-            year_col = df.columns[cols_lower.index(cand)]
-            break
-    # detect production column
-    prod_col = None
-    for cand in ["production_tonnes", "production", "production (tonnes)", "production (t)","quantity"]:
-        if cand in cols_lower:
-            prod_col = df.columns[cols_lower.index(cand)]
-            break
-    # detect state, crop columns
-    state_col = None
-    for cand in ["state", "st", "state_name"]:
-        if cand in cols_lower:
-            state_col = df.columns[cols_lower.index(cand)]
-            break
-    crop_col = None
-    for cand in ["crop", "commodity", "crop_name"]:
-        if cand in cols_lower:
-            crop_col = df.columns[cols_lower.index(cand)]
-            break
+    df = df_crop
+    lut = _col_lut(df)
+    year_col = _detect_col(lut, ["year", "season", "reporting_year"])
+    prod_col = _detect_col(lut, ["production_tonnes", "production", "production (tonnes)", "production (t)", "quantity"])
+    state_col = _detect_col(lut, ["state", "st", "state_name"])
+    crop_col = _detect_col(lut, ["crop", "commodity", "crop_name"])
 
     # fallback names
     year_col = year_col or "year"
@@ -93,82 +224,82 @@ def top_crops_by_volume(df_crop: pd.DataFrame, state: str, last_n_years:int, top
     state_col = state_col or "state"
     crop_col = crop_col or "crop"
 
-    # coerce types
     if year_col in df.columns:
-        df[year_col] = pd.to_numeric(df[year_col], errors="coerce")
-        max_year = int(df[year_col].dropna().astype(int).max()) if df[year_col].dropna().size>0 else None
+        year_series = _numeric_year(df[year_col])
+        max_year = int(year_series.dropna().astype(int).max()) if year_series.dropna().size>0 else None
     else:
-        max_year = None
+        year_series, max_year = None, None
+    min_year = max_year - last_n_years + 1 if max_year else None
+
+    # categorical crop/state (as returned by the loaders): one fused pass, no masks or slices
+    agg = _top_crops_fused(df, year_series, max_year, min_year, state_col, state, crop_col, prod_col)
+    if agg is not None:
+        return agg.sort_values(prod_col, ascending=False).head(top_m)
 
+    # build one row mask over the (possibly cached) input instead of copying it
+    mask = pd.Series(True, index=df.index)
     if max_year:
-        min_year = max_year - last_n_years + 1
-        df = df[(df[year_col] >= min_year) & (df[year_col] <= max_year)]
+        mask &= year_series.between(min_year, max_year)
     # filter by state if present
     if state_col in df.columns:
-        dff = df[df[state_col] == state]
-    else:
-        dff = df
+        mask &= df[state_col] == state
 
-    # ensure production numeric
-    if prod_col in dff.columns:
-        dff[prod_col] = pd.to_numeric(dff[prod_col], errors="coerce").fillna(0)
+    # ensure production numeric before filtering, so the filtered rows are never written back to
+    if prod_col in df.columns:
+        prod = df[prod_col] if pd.api.types.is_numeric_dtype(df[prod_col]) else pd.to_numeric(df[prod_col], errors="coerce")
+        prod = prod.fillna(0)
     else:
-        dff[prod_col] = 0
+        prod = pd.Series(0, index=df.index)
 
-    agg = dff.groupby(crop_col)[prod_col].sum().reset_index().sort_values(prod_col, ascending=False)
+    agg = prod[mask].groupby(df.loc[mask, crop_col], observed=True).sum().rename(prod_col).reset_index()
+    agg = agg.sort_values(prod_col, ascending=False)
     return agg.head(top_m)
 
 def production_trend(df_crop: pd.DataFrame, crop_name: str, region_filter: dict = None):
     # collapse to yearly totals for a crop
-    df = df_crop.copy()
-    cols_lower = [c.lower() for c in df.columns]
+    df = df_crop
     # detect columns
-    year_col = None
-    for cand in ["year", "season"]:
-        if cand in cols_lower:
-            year_col = df.columns[cols_lower.index(cand)]
-            break
-    if not year_col:
-        df["year"] = pd.NaT
-        year_col = "year"
-    crop_col = None
-    for cand in ["crop", "commodity"]:
-        if cand in cols_lower:
-            crop_col = df.columns[cols_lower.index(cand)]
-            break
-    if not crop_col:
-        crop_col = "crop"
-    prod_col = None
-    for cand in ["production_tonnes", "production"]:
-        if cand in cols_lower:
-            prod_col = df.columns[cols_lower.index(cand)]
-            break
-    prod_col = prod_col or "production_tonnes"
-    df[prod_col] = pd.to_numeric(df.get(prod_col, 0), errors="coerce").fillna(0)
-    # filter crop
-    dff = df[df[crop_col].astype(str).str.lower() == crop_name.lower()].copy()
+    lut = _col_lut(df)
+    year_col = _detect_col(lut, ["year", "season"])
+    crop_col = _detect_col(lut, ["crop", "commodity"]) or "crop"
+    prod_col = _detect_col(lut, ["production_tonnes", "production"]) or "production_tonnes"
+    # filter crop (and region) with a mask, then copy only the matching rows
+    mask = _ci_equal_mask(df[crop_col], crop_name)
     if region_filter:
         for k, v in region_filter.items():
-            if k in dff.columns:
-                dff = dff[dff[k] == v]
+            if k in df.columns:
+                mask &= _isin_mask(df[k], [v])
+    dff = df.loc[mask, [c for c in (year_col, prod_col) if c in df.columns]].copy()
+    if not year_col:
+        dff["year"] = pd.NaT
+        year_col = "year"
+    dff[prod_col] = pd.to_numeric(dff.get(prod_col, 0), errors="coerce").fillna(0)
     # group
     if year_col in dff.columns:
-        dff[year_col] = pd.to_numeric(dff[year_col], errors="coerce")
+        dff[year_col] = _numeric_year(dff[year_col])
         ts = dff.groupby(year_col)[prod_col].sum().reset_index().dropna()
     else:
         ts = pd.DataFrame([[0, dff[prod_col].sum()]], columns=["year", prod_col])
     # linear trend
     if len(ts) >= 2:
-        x = ts["year"].astype(float).values
-        y = ts[prod_col].astype(float).values
-        A = np.vstack([x, np.ones(len(x))]).T
-        m, c = np.linalg.lstsq(A, y, rcond=None)[0]
+        # closed-form simple OLS; a 2-column design matrix doesn't need LAPACK lstsq
+        x = np.ascontiguousarray(ts["year"].to_numpy(dtype=np.float64))
+        y = np.ascontiguousarray(ts[prod_col].to_numpy(dtype=np.float64))
+        xm, ym = x.mean(), y.mean()
+        dx = x - xm
+        sxx = dx.dot(dx)
+        if sxx > 0:
+            m = dx.dot(y - ym) / sxx
+            c = ym - m * xm
+        else:
+            # all years identical: flat line through the mean
+            m, c = 0.0, ym
     else:
         m, c = 0.0, float(ts[prod_col].sum() or 0)
     return ts.rename(columns={prod_col: "production_tonnes"}), {"slope_per_year": float(m), "intercept": float(c)}
 
 def correlate_production_with_climate(df_prod: pd.DataFrame, df_climate: pd.DataFrame, crop_name: str, state: str, last_n_years:int):
-    # produce annual production sums and merge with climate metric per year, then compute Pearson
+    # produce annual production sums and align with climate metric per year, then compute Pearson
     ts_prod, _ = production_trend(df_prod, crop_name, region_filter={"state": state})
     # get climate metric
     try:
@@ -176,13 +307,17 @@ def correlate_production_with_climate(df_prod: pd.DataFrame, df_climate: pd.Data
         metric = meta["metric_column"]
         # need year-level climate per year for correlation; fallback: try to pivot df_climate to year->metric
         # if df_climate has a 'year' column and state column we can get yearwise metric
-        cols_lower = [c.lower() for c in df_climate.columns]
-        year_col = df_climate.columns[cols_lower.index("year")] if "year" in cols_lower else None
-        state_col = df_climate.columns[cols_lower.index("state")] if "state" in cols_lower else None
+        lut = _col_lut(df_climate)
+        year_col = _detect_col(lut, ["year"])
+        state_col = _detect_col(lut, ["state"])
         if year_col and state_col and metric in df_climate.columns:
-            cagg = df_climate[df_climate[state_col] == state].groupby(year_col)[metric].mean().reset_index().rename(columns={metric: metric})
-            merged = pd.merge(ts_prod, cagg, left_on="year", right_on=year_col, how="inner")
-            corr = float(merged["production_tonnes"].corr(merged[metric])) if len(merged)>=2 else None
+            cagg = df_climate[df_climate[state_col] == state].groupby(year_col, observed=True)[metric].mean()
+            # both sides are unique per year, so an inner index align replaces a hash merge
+            a, b = ts_prod.set_index("year")["production_tonnes"].align(cagg, join="inner")
+            merged = pd.DataFrame({"year": a.index, "production_tonnes": a.to_numpy(), metric: b.to_numpy()})
+            if year_col != "year":
+                merged.insert(2, year_col, a.index)
+            corr = _pearson(a.to_numpy(np.float64), b.to_numpy(np.float64)) if len(merged)>=2 else None
             return merged, {"pearson_corr": corr, "climate_metric": metric}
     except Exception:
         pass
@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 
 # Define paths for the datasets
@@ -13,14 +14,21 @@ datasets = {
 # Function to load all datasets
 def load_datasets():
     # Load each dataset into a dictionary of DataFrames
+    # read_csv releases the GIL while parsing, so the files are read on parallel threads
     dataframes = {}
-    
-    for name, path in datasets.items():
-        try:
+    if not datasets:
+        return dataframes
+
+    with ThreadPoolExecutor(max_workers=min(6, len(datasets))) as ex:
+        futures = {}
+        for name, path in datasets.items():
             print(f"Loading {name} dataset...")
-            dataframes[name] = pd.read_csv(path)
-        except Exception as e:
-            print(f"Error loading {name}: {e}")
+            futures[name] = ex.submit(pd.read_csv, path)
+        for name, fut in futures.items():
+            try:
+                dataframes[name] = fut.result()
+            except Exception as e:
+                print(f"Error loading {name}: {e}")
     
     return dataframes
 
@@ -1,28 +1,193 @@
 # app/loaders.py
 import os
 import re
+import hashlib
+import functools
+import threading
 import pandas as pd
 from .config import DATA_DIR
 
+CACHE_DIR = os.path.join(DATA_DIR, ".cache")
+# bump when the normalized frame layout changes so stale parquet files are ignored
+CACHE_VERSION = 5
+
+# compiled once; used for wide-column detection and year extraction
+_PROD_COL_RE = re.compile(r"\d{4}[-–]\d{2}\s*-\s*Production", re.I)
+_YEAR_RE = re.compile(r"(\d{4})[-–]\d{2}")
+_YEAR4_RE = re.compile(r"(\d{4})")
+
+# filename substrings used to locate each dataset under DATA_DIR (first match wins)
+CROP_PRODUCTION_FILES = ("crop-wise details of production",)
+CLIMATE_FILES = ("seasonal and annual minmax", "year-wise climate risk")
+YIELD_FILES = ("all india level yield",)
+
+# in-memory (df, meta) results keyed on (loader, path, mtime_ns, args); FIFO-evicted
+_LOADER_CACHE = {}
+_LOADER_CACHE_MAX = 16
+_LOADER_CACHE_LOCK = threading.Lock()
+
+@functools.lru_cache(maxsize=1)
+def _list_data_dir():
+    return tuple(os.listdir(DATA_DIR))
+
+@functools.lru_cache(maxsize=64)
 def _find_file_contains(substr):
     substr = substr.lower()
-    for fname in os.listdir(DATA_DIR):
+    for fname in _list_data_dir():
         if substr in fname.lower():
             return os.path.join(DATA_DIR, fname)
     return None
 
-def _read_csv_safe(path, **kwargs):
+def _resolve_path(substrs):
+    for substr in substrs:
+        path = _find_file_contains(substr)
+        if path:
+            return path
+    return None
+
+def clear_caches():
+    """Forget the memoized data directory listing and loader results (call after changing DATA_DIR)."""
+    _list_data_dir.cache_clear()
+    _find_file_contains.cache_clear()
+    with _LOADER_CACHE_LOCK:
+        _LOADER_CACHE.clear()
+
+def _attach_col_lut(result):
+    """Record {lowercased name: original name} in df.attrs so analytics can skip re-lowercasing columns."""
+    df = result[0] if isinstance(result, tuple) else result
+    if isinstance(df, pd.DataFrame):
+        lut = {}
+        for c in df.columns:
+            lut.setdefault(str(c).lower(), c)
+        df.attrs["cols_lower"] = lut
+    return result
+
+def _freeze(value):
+    """Hashable form of loader arguments (lists such as `columns` become tuples)."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+def lru_cached_by_mtime(substrs):
+    """
+    Memoize a loader's (df, meta) result keyed on the resolved data file and its mtime.
+    Cached frames are shared between callers and must be treated as read-only.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            path = _resolve_path(substrs)
+            if not path:
+                return _attach_col_lut(fn(*args, **kwargs))
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                return _attach_col_lut(fn(*args, **kwargs))
+            key = (fn.__name__, path, mtime, _freeze(args), _freeze(sorted(kwargs.items())))
+            with _LOADER_CACHE_LOCK:
+                hit = _LOADER_CACHE.get(key)
+            if hit is not None:
+                return hit
+            result = _attach_col_lut(fn(*args, **kwargs))
+            with _LOADER_CACHE_LOCK:
+                while len(_LOADER_CACHE) >= _LOADER_CACHE_MAX:
+                    _LOADER_CACHE.pop(next(iter(_LOADER_CACHE)))
+                _LOADER_CACHE[key] = result
+            return result
+        return wrapper
+    return decorator
+
+def _cache_path(path, tag="raw"):
+    """Parquet cache location for `path`, keyed on (path, mtime, size) so edits invalidate it."""
+    st = os.stat(path)
+    key_src = f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}|{tag}|v{CACHE_VERSION}"
+    key = hashlib.blake2b(key_src.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, key + ".parquet")
+
+def _read_cached(path, tag="raw"):
+    """Return the cached DataFrame for (path, tag) or None on miss / unreadable cache."""
     try:
-        return pd.read_csv(path, low_memory=False, **kwargs)
+        cache_path = _cache_path(path, tag)
+        if os.path.exists(cache_path):
+            return pd.read_parquet(cache_path)
     except Exception:
-        return pd.read_csv(path, encoding="latin1", low_memory=False, **kwargs)
+        pass
+    return None
 
-def load_crop_production():
+def _write_cached(df, path, tag="raw"):
+    """Best-effort write of `df` to the parquet cache; failures only cost a re-parse next time."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        df.to_parquet(_cache_path(path, tag), engine="pyarrow", compression="zstd")
+    except Exception:
+        pass
+
+def _as_category(df, cols=("crop", "state")):
+    """Store low-cardinality label columns as categoricals so groupbys hash integer codes."""
+    for c in cols:
+        if c in df.columns:
+            df[c] = df[c].astype("category")
+    return df
+
+def _coerce_year(df, col="year"):
+    """
+    Loader contract: `year` is integer-typed with no missing values.
+    Extracts the start year from labels like '2014-15', drops rows without one and downcasts.
+    """
+    if col not in df.columns:
+        return df
+    s = df[col]
+    if not pd.api.types.is_numeric_dtype(s):
+        s = s.astype(str).str.extract(_YEAR4_RE, expand=False)
+    df = df.assign(**{col: pd.to_numeric(s, errors="coerce")}).dropna(subset=[col])
+    return df.assign(**{col: pd.to_numeric(df[col], downcast="integer")}).reset_index(drop=True)
+
+def _read_header(path):
+    """Return the raw column names of a CSV without parsing any data rows ([] if unreadable)."""
+    for encoding in ("utf-8", "latin1"):
+        try:
+            return list(pd.read_csv(path, nrows=0, encoding=encoding).columns)
+        except Exception:
+            pass
+    return []
+
+def _read_csv_safe(path, **kwargs):
+    # read options (e.g. usecols) change the parsed frame, so they are part of the cache key
+    tag = "raw|" + repr(sorted(kwargs.items())) if kwargs else "raw"
+    cached = _read_cached(path, tag)
+    if cached is not None:
+        return cached
+    df = None
+    # pyarrow tokenizes on multiple threads; keep numpy dtypes so downstream code is unchanged
+    for encoding in ("utf-8", "latin1"):
+        try:
+            df = pd.read_csv(path, engine="pyarrow", encoding=encoding, parse_dates=False, **kwargs)
+            break
+        except Exception:
+            pass
+    if df is None:
+        try:
+            df = pd.read_csv(path, engine="c", low_memory=False, parse_dates=False, **kwargs)
+        except Exception:
+            try:
+                df = pd.read_csv(path, engine="c", encoding="latin1", low_memory=False, parse_dates=False, **kwargs)
+            except Exception:
+                if "dtype" not in kwargs:
+                    raise
+                # dtype hints are advisory: fall back to inference when the data doesn't fit them
+                return _read_csv_safe(path, **{k: v for k, v in kwargs.items() if k != "dtype"})
+    _write_cached(df, path, tag)
+    return df
+
+@lru_cached_by_mtime(CROP_PRODUCTION_FILES)
+def load_crop_production(columns=None):
     """
     Load the national/wide crop production CSV and normalize to long form:
     returns (df, meta) where df has columns: ['year', 'crop', 'production_tonnes', ...]
+    `columns` optionally restricts the raw CSV columns that are parsed (read_csv usecols);
+    by default only the crop and '<year> - Production' columns found in the header are read.
     """
-    path = _find_file_contains("crop-wise details of production")
+    path = _resolve_path(CROP_PRODUCTION_FILES)
     if not path:
         # fallback sample
         df = pd.DataFrame([
@@ -31,7 +196,28 @@ def load_crop_production():
         ])
         return df, {"source_file": "sample_crop_production", "full_path": None}
 
-    raw = _read_csv_safe(path)
+    meta = {"source_file": os.path.basename(path), "full_path": path}
+    long_tag = "crop_long" if columns is None else "crop_long|" + repr(list(columns))
+    cached = _read_cached(path, long_tag)
+    if cached is not None:
+        return cached, meta
+
+    dtype = None
+    if columns is None:
+        # probe the header so the wide per-year columns we don't melt (area, yield, ...) are never parsed
+        header = {c.strip(): c for c in _read_header(path)}
+        probe_crop = next((c for c in ["Crops", "Crop", "crop", "Crop Name", "Crop_Name"] if c in header), None)
+        probe_prod = [c for c in header if _PROD_COL_RE.search(c)]
+        if probe_crop and probe_prod:
+            columns = [header[probe_crop]] + [header[c] for c in probe_prod]
+            # declared dtypes skip per-column type inference; production stays float64 for exact answer text
+            dtype = {header[probe_crop]: "category", **{header[c]: "float64" for c in probe_prod}}
+    read_opts = {}
+    if columns is not None:
+        read_opts["usecols"] = list(columns)
+    if dtype:
+        read_opts["dtype"] = dtype
+    raw = _read_csv_safe(path, **read_opts)
     raw.columns = [c.strip() for c in raw.columns]
 
     # attempt to find the crop/name column
@@ -42,7 +228,7 @@ def load_crop_production():
             break
 
     # find columns that denote production with pattern like '2016-17 - Production'
-    prod_cols = [c for c in raw.columns if re.search(r"\d{4}[-–]\d{2}\s*-\s*Production", c, flags=re.I)]
+    prod_cols = [c for c in raw.columns if _PROD_COL_RE.search(c)]
     # also accept columns that end with ' - Production' or contain 'Production'
     if not prod_cols:
         prod_cols = [c for c in raw.columns if "production" in c.lower()]
@@ -51,23 +237,22 @@ def load_crop_production():
     if prod_cols and crop_col:
         melt = raw[[crop_col] + prod_cols].melt(id_vars=[crop_col], value_vars=prod_cols,
                                                 var_name="year_col", value_name="production_tonnes")
-        # extract year from year_col (take first 4 digits as start year)
-        def parse_year(s):
-            m = re.search(r"(\d{4})[-–](\d{2})", s)
-            if m:
-                return int(m.group(1))  # choose start year
-            # fallback: first 4 digits anywhere
-            m2 = re.search(r"(\d{4})", s)
-            return int(m2.group(1)) if m2 else None
-        melt["year"] = melt["year_col"].apply(parse_year)
-        melt = melt.rename(columns={crop_col: "crop"})
+        # extract year from year_col (start year of '2016-17', else first 4 digits anywhere)
+        year_str = melt["year_col"].str.extract(_YEAR_RE, expand=False)
+        year_str = year_str.fillna(melt["year_col"].str.extract(_YEAR4_RE, expand=False))
+        melt["year"] = pd.to_numeric(year_str, errors="coerce")
+        melt = melt.dropna(subset=["year"]).rename(columns={crop_col: "crop"})
         melt["production_tonnes"] = pd.to_numeric(melt["production_tonnes"], errors="coerce").fillna(0)
         df_out = melt[["year", "crop", "production_tonnes"]].sort_values(["crop", "year"]).reset_index(drop=True)
-        return df_out, {"source_file": os.path.basename(path), "full_path": path}
+        # nullable 32-bit year halves the bytes scanned by year-range filters
+        df_out = _as_category(df_out.astype({"year": "Int32"}))
+        _write_cached(df_out, path, long_tag)
+        return df_out, meta
 
     # If not the expected wide format, try to guess a tidy table already present:
     # look for columns like 'Year', 'state', 'crop', 'production'
-    candidates = raw.copy()
+    # no defensive copy: `raw` is a fresh parse, and rename() below hands back a new frame before any assignment
+    candidates = raw
     cols_lower = [c.lower() for c in candidates.columns]
     if any(x in cols_lower for x in ("production", "production_tonnes", "quantity")):
         # try to normalize names
@@ -84,17 +269,22 @@ def load_crop_production():
         candidates = candidates.rename(columns=rename_map)
         if "production_tonnes" in candidates.columns:
             candidates["production_tonnes"] = pd.to_numeric(candidates["production_tonnes"], errors="coerce").fillna(0)
+            candidates = _as_category(_coerce_year(candidates))
             return candidates, {"source_file": os.path.basename(path), "full_path": path}
 
-    # fallback: return raw as-is (caller will handle)
+    # fallback: return raw as-is (caller will handle); crop labels still become categoricals once here
+    raw = _as_category(raw, [c for c in raw.columns if c.lower() in ("crop", "crops", "commodity", "crops name", "cropsname")])
     return raw, {"source_file": os.path.basename(path), "full_path": path}
 
-def load_climate_temp_series():
+@lru_cached_by_mtime(CLIMATE_FILES)
+def load_climate_temp_series(columns=None):
     """
     Load the climate CSV and return a simplified table:
     columns: ['year', 'annual_mean_temp_c'] (national series if no state present)
+    `columns` optionally restricts the raw CSV columns that are parsed (read_csv usecols);
+    by default only year + annual min/max found in the header are read.
     """
-    path = _find_file_contains("seasonal and annual minmax") or _find_file_contains("year-wise climate risk")
+    path = _resolve_path(CLIMATE_FILES)
     if not path:
         # fallback sample
         df = pd.DataFrame([
@@ -103,9 +293,23 @@ def load_climate_temp_series():
         ])
         return df, {"source_file": "sample_climate", "full_path": None}
 
-    raw = _read_csv_safe(path)
+    dtype = None
+    if columns is None:
+        # probe the header so only year + annual min/max are parsed (pyarrow include_columns via usecols)
+        header = {c.strip(): c for c in _read_header(path)}
+        probe_year = next((c for c in ("year", "YEAR", "Year") if c in header), None)
+        probe_min = next((c for c in header if "annual - min" in c.lower()), None)
+        probe_max = next((c for c in header if "annual - max" in c.lower()), None)
+        if probe_year and (probe_min or probe_max):
+            columns = [header[c] for c in (probe_year, probe_min, probe_max) if c]
+            dtype = {header[probe_year]: "int32", **{header[c]: "float64" for c in (probe_min, probe_max) if c}}
+    read_opts = {}
+    if columns is not None:
+        read_opts["usecols"] = list(columns)
+    if dtype:
+        read_opts["dtype"] = dtype
+    raw = _read_csv_safe(path, **read_opts)
     raw.columns = [c.strip() for c in raw.columns]
-    cols_lower = [c.lower() for c in raw.columns]
 
     # detect year column
     year_col = None
@@ -135,21 +339,26 @@ def load_climate_temp_series():
             # if only one of them present, use that as proxy
             col = min_col or max_col
             raw["annual_mean_temp_c"] = pd.to_numeric(raw[col], errors="coerce")
-        out = raw.rename(columns={year_col: "year"})[["year", "annual_mean_temp_c"]].dropna(subset=["year"])
-        out["year"] = pd.to_numeric(out["year"], errors="coerce").astype(int)
-        return out.reset_index(drop=True), {"source_file": os.path.basename(path), "full_path": path}
+        out = _coerce_year(raw.rename(columns={year_col: "year"})[["year", "annual_mean_temp_c"]])
+        return out, {"source_file": os.path.basename(path), "full_path": path}
 
     # If climate file is differently structured (e.g., state-wise), return full dataframe and meta
     return raw, {"source_file": os.path.basename(path), "full_path": path}
 
+@lru_cached_by_mtime(YIELD_FILES)
 def load_yield_all_india():
     """
     Load All-India yield CSV and normalize to long form: columns ['year', 'crop', 'yield_kg_per_ha']
     """
-    path = _find_file_contains("all india level yield")
+    path = _resolve_path(YIELD_FILES)
     if not path:
         return pd.DataFrame(), {"source_file": "sample_yield", "full_path": None}
 
+    meta = {"source_file": os.path.basename(path), "full_path": path}
+    cached = _read_cached(path, "yield_long")
+    if cached is not None:
+        return cached, meta
+
     raw = _read_csv_safe(path)
     raw.columns = [c.strip() for c in raw.columns]
 
@@ -158,13 +367,11 @@ def load_yield_all_india():
         # melt other crop columns (e.g., Rice, Wheat) to long form
         value_cols = [c for c in raw.columns if c != "Year"]
         df_long = raw.melt(id_vars=["Year"], value_vars=value_cols, var_name="crop", value_name="yield_kg_per_ha")
-        def yr_to_int(s):
-            m = re.search(r"(\d{4})", str(s))
-            return int(m.group(1)) if m else None
-        df_long["year"] = df_long["Year"].apply(yr_to_int)
+        df_long["year"] = df_long["Year"]
         df_long["yield_kg_per_ha"] = pd.to_numeric(df_long["yield_kg_per_ha"], errors="coerce")
-        df_long = df_long[["year", "crop", "yield_kg_per_ha"]].dropna(subset=["year"])
-        return df_long.reset_index(drop=True), {"source_file": os.path.basename(path), "full_path": path}
+        df_long = _as_category(_coerce_year(df_long[["year", "crop", "yield_kg_per_ha"]]))
+        _write_cached(df_long, path, "yield_long")
+        return df_long, meta
 
     # fallback: return raw
-    return raw, {"source_file": os.path.basename(path), "full_path": path}
+    return raw, meta
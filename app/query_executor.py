@@ -1,11 +1,22 @@
 ﻿# app/query_executor.py
 import re
+import numpy as np
 import pandas as pd
 import traceback
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from .loaders import load_crop_production, load_climate_temp_series, load_yield_all_india
-from .utils import fig_to_base64
+from .utils import fig_to_png
 import matplotlib.pyplot as plt
 
+_RE_LAST_N = re.compile(r"last\s+(\d+)\s+(?:years|year)")
+_RE_TOP_M = re.compile(r"top\s+(\d+)")
+_RE_PUNCT = re.compile(r"[-_/\\(),]+")
+_RE_WS = re.compile(r"\s+")
+
+CROP_LOW_SET = frozenset(("crop", "crops", "commodity", "crops name", "cropsname", "crops "))
+YEAR_LOW_SET = frozenset(("year", "season", "financial_year", "year "))
+
 def _unwrap_loader_result(ret):
     """Accept either df or (df, meta) and return (df, meta_dict)."""
     if isinstance(ret, tuple) and len(ret) >= 1:
@@ -15,43 +26,101 @@ def _unwrap_loader_result(ret):
     else:
         return ret, {}
 
+# id(df) -> (weakref to df, df.columns at the time, (df_norm, col_map)); entries drop out when df is collected
+_NORM_CACHE = {}
+
+# id(df) -> (weakref to df, df.columns at the time, (cols, notes)) from _detect_climate_columns;
+# same lifetime rules as _NORM_CACHE, so the cached climate loader frame is detected once
+_SCHEMA_CACHE = {}
+
+# shared by requests so concurrent loading doesn't pay for pool/thread start-up each time
+_LOAD_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="loader")
+
+def _load_normalized(loader):
+    """Call a (cached) loader and return (df, meta, df_norm, col_map)."""
+    df, meta = _unwrap_loader_result(loader())
+    df_norm, col_map = _normalize_columns(df) if isinstance(df, pd.DataFrame) else (None, {})
+    return df, meta, df_norm, col_map
+
+def _cached_crop():
+    return _load_normalized(load_crop_production)
+
+def _cached_climate():
+    return _load_normalized(load_climate_temp_series)
+
 def parse_question(question: str):
     raw = (question or "").strip()
     q = raw.lower()
-    n_match = re.search(r"last\s+(\d+)\s+(?:years|year)", q)
+    # cheap substring checks skip the regex engine for most questions
+    n_match = _RE_LAST_N.search(q) if "last" in q else None
     N = int(n_match.group(1)) if n_match else 5
-    m_match = re.search(r"top\s+(\d+)", q)
+    m_match = _RE_TOP_M.search(q) if "top" in q else None
     M = int(m_match.group(1)) if m_match else 3
-    return {"raw": raw, "N": N, "M": M}
+    want_chart = "chart" in q or "plot" in q or "graph" in q
+    return {"raw": raw, "N": N, "M": M, "want_chart": want_chart}
 
 def _normalize_columns(df: pd.DataFrame):
     """
     Return a mapping of normalized_column -> original_column_name and a DataFrame view
     where columns are normalized (lowercase, punctuation -> single space).
+    Memoized per DataFrame object; assigning new columns to `df` invalidates the entry.
     """
+    key = id(df)
+    hit = _NORM_CACHE.get(key)
+    if hit is not None and hit[0]() is df and hit[1] is df.columns:
+        return hit[2]
+
     def norm(s):
         if s is None:
             return ""
         s = str(s)
         s = s.strip()
         # replace punctuation with space, collapse spaces, lowercase
-        s = re.sub(r"[-_/\\(),]+", " ", s)
-        s = re.sub(r"\s+", " ", s)
+        s = _RE_PUNCT.sub(" ", s)
+        s = _RE_WS.sub(" ", s)
         return s.lower()
     col_map = {norm(c): c for c in df.columns}
     df_norm = df.rename(columns={orig: norm(orig) for orig in df.columns})
-    return df_norm, col_map
-
-def _is_year_like_series(s: pd.Series):
-    """Return True if series looks like years (numeric values between 1800 and 2100)."""
+    result = (df_norm, col_map)
     try:
-        nums = pd.to_numeric(s, errors="coerce").dropna()
-        if nums.shape[0] < 3:
-            return False
-        mn, mx = int(nums.min()), int(nums.max())
-        return 1800 <= mn <= mx <= 2100
-    except Exception:
-        return False
+        ref = weakref.ref(df, lambda _, key=key: _NORM_CACHE.pop(key, None))
+    except TypeError:
+        return result
+    _NORM_CACHE[key] = (ref, df.columns, result)
+    return result
+
+def _head_records(df: pd.DataFrame, n: int, na_value=None):
+    """
+    First `n` rows as a list of dicts, built column by column (cheaper than to_dict(orient="records")).
+    Missing values (NaN, None, pd.NA) all become `na_value`, so the rows stay JSON-serializable.
+    """
+    head = df.iloc[:n]
+    cols = [head.iloc[:, i].to_numpy(dtype=object, na_value=na_value).tolist() for i in range(head.shape[1])]
+    names = list(head.columns)
+    return [dict(zip(names, row)) for row in zip(*cols)]
+
+def _numeric_frame(df_norm: pd.DataFrame, columns=None):
+    """
+    Numeric view of `columns` (default: all) in one frame. Numeric dtypes are used as-is and text
+    columns are only coerced when a small sample parses as numbers; anything else is left out.
+    """
+    nums = {}
+    for nc in (df_norm.columns if columns is None else columns):
+        col = df_norm[nc]
+        if pd.api.types.is_numeric_dtype(col):
+            nums[nc] = col
+        elif pd.api.types.is_object_dtype(col) or pd.api.types.is_string_dtype(col):
+            sample = col.dropna().iloc[:32]
+            if pd.to_numeric(sample, errors="coerce").notna().any():
+                nums[nc] = pd.to_numeric(col, errors="coerce")
+    return pd.DataFrame(nums, index=df_norm.index)
+
+def _year_like_columns(df_num: pd.DataFrame):
+    """Columns of a numeric frame that look like years (>= 3 values, all between 1800 and 2100)."""
+    if df_num.shape[1] == 0:
+        return df_num.columns
+    counts = df_num.count()
+    return df_num.columns[((counts >= 3) & (df_num.min() >= 1800) & (df_num.max() <= 2100)).to_numpy()]
 
 def _find_annual_min_max_candidates(df_norm: pd.DataFrame):
     """
@@ -77,40 +146,86 @@ def _find_annual_min_max_candidates(df_norm: pd.DataFrame):
                 break
     return min_col, max_col
 
-def _fallback_numeric_pair(df_norm: pd.DataFrame):
+def _fallback_numeric_pair(df_norm: pd.DataFrame, df_num=None):
     """
     If no explicit min/max columns found, try to find numeric columns that look like min/max
     but IGNORE year-like columns. Return (min_col_norm, max_col_norm).
     If exactly one plausible numeric (temperature-like) column exists, return (that_col, None)
     so that code will use it directly as the annual metric (no averaging with year).
+    `df_num` may carry an already-coerced _numeric_frame of df_norm.
     """
-    numeric_cols = []
-    for nc in df_norm.columns:
-        # skip obvious year-like names
-        if "year" in nc:
-            continue
-        try:
-            nums = pd.to_numeric(df_norm[nc], errors="coerce").dropna()
-            if nums.shape[0] >= 3:
-                mean_val = float(nums.mean())
-                # heuristics: temperature-like mean in a plausible range (-60..80)
-                if -60.0 <= mean_val <= 80.0:
-                    numeric_cols.append((nc, mean_val))
-        except Exception:
-            pass
+    # skip obvious year-like names
+    if df_num is None:
+        df_num = _numeric_frame(df_norm, [nc for nc in df_norm.columns if "year" not in nc])
+    else:
+        df_num = df_num[[nc for nc in df_num.columns if "year" not in nc]]
+    if df_num.shape[1] == 0:
+        return None, None
+    means = df_num.mean()
+    counts = df_num.count()
+    # heuristics: at least 3 values and a temperature-like mean in a plausible range (-60..80)
+    numeric_cols = means[(counts >= 3) & means.between(-60.0, 80.0)].sort_values(kind="stable")
     if len(numeric_cols) == 1:
         # single plausible numeric column: use as annual_mean (no averaging with year)
-        return numeric_cols[0][0], None
+        return numeric_cols.index[0], None
     if len(numeric_cols) >= 2:
-        numeric_cols.sort(key=lambda x: x[1])
-        return numeric_cols[0][0], numeric_cols[-1][0]
+        return numeric_cols.index[0], numeric_cols.index[-1]
     return None, None
 
-def _compute_national_climate_avg(df_clim_raw, last_n_years: int):
+def _detect_climate_columns(df_clim_raw, normalized, notes):
+    """
+    Find the (year, annual min, annual max) original column names of a climate frame, or None.
+    Value-based fallbacks append to `notes`; name-only detection leaves it untouched.
+    """
+    # normalize columns for detection
+    df_norm, col_map = normalized if normalized is not None else _normalize_columns(df_clim_raw)
+
+    # find year column normalized
+    year_col_norm = None
+    df_num = None
+    if "year" in df_norm.columns:
+        year_col_norm = "year"
+    else:
+        for nc in df_norm.columns:
+            if nc.strip() == "year":
+                year_col_norm = nc
+                break
+    if year_col_norm is None:
+        # fallback: numeric-like column that looks like years (coerced once, reused below)
+        try:
+            df_num = _numeric_frame(df_norm)
+            year_candidates = _year_like_columns(df_num)
+            if len(year_candidates):
+                year_col_norm = year_candidates[0]
+                notes.append(f"Using numeric-like column '{year_col_norm}' as year")
+        except Exception:
+            df_num = None
+
+    if year_col_norm is None:
+        notes.append("No year-like column found")
+        return None
+
+    # find annual min/max normalized column names
+    min_col_norm, max_col_norm = _find_annual_min_max_candidates(df_norm)
+    if not min_col_norm and not max_col_norm:
+        notes.append("No 'annual min/max' tokens found — trying numeric fallback")
+        min_col_norm, max_col_norm = _fallback_numeric_pair(df_norm, df_num)
+
+    if not min_col_norm and not max_col_norm:
+        notes.append("No candidate min/max columns found even after fallback")
+        return None
+
+    # map normalized back to original names
+    return (col_map.get(year_col_norm, year_col_norm),
+            col_map.get(min_col_norm) if min_col_norm else None,
+            col_map.get(max_col_norm) if max_col_norm else None)
+
+def _compute_national_climate_avg(df_clim_raw, last_n_years: int, normalized=None):
     """
     Robust detection of YEAR and annual min/max columns.
     Returns (climate_out_df, meta) or (None, {}).
     meta contains years_used, rows_used, original column names, and helpful debug fields.
+    `normalized` may carry a precomputed (df_norm, col_map) for df_clim_raw.
     """
     meta_debug = {"columns_sample": None, "rows_sample": None, "detection_notes": []}
 
@@ -130,79 +245,61 @@ def _compute_national_climate_avg(df_clim_raw, last_n_years: int):
     # sample columns & rows (for provenance)
     try:
         meta_debug["columns_sample"] = list(df_clim_raw.columns)
-        meta_debug["rows_sample"] = df_clim_raw.head(10).fillna("").to_dict(orient="records")
+        meta_debug["rows_sample"] = _head_records(df_clim_raw, 10, na_value="")
     except Exception:
         meta_debug["columns_sample"] = list(df_clim_raw.columns)
 
-    # normalize columns for detection
-    df_norm, col_map = _normalize_columns(df_clim_raw)
-
-    # find year column normalized
-    year_col_norm = None
-    if "year" in df_norm.columns:
-        year_col_norm = "year"
+    # detection (including value-based fallbacks) is memoized per frame; its notes are replayed on a hit
+    key = id(df_clim_raw)
+    hit = _SCHEMA_CACHE.get(key)
+    if hit is not None and hit[0]() is df_clim_raw and hit[1] is df_clim_raw.columns:
+        cols, notes = hit[2]
     else:
-        for nc in df_norm.columns:
-            if nc.strip() == "year":
-                year_col_norm = nc
-                break
-    if year_col_norm is None:
-        # fallback: numeric-like column that looks like years
-        for nc in df_norm.columns:
-            try:
-                if _is_year_like_series(df_norm[nc]):
-                    year_col_norm = nc
-                    meta_debug["detection_notes"].append(f"Using numeric-like column '{nc}' as year")
-                    break
-            except Exception:
-                pass
-
-    if year_col_norm is None:
-        meta_debug["detection_notes"].append("No year-like column found")
-        return None, meta_debug
-
-    # find annual min/max normalized column names
-    min_col_norm, max_col_norm = _find_annual_min_max_candidates(df_norm)
-    if not min_col_norm and not max_col_norm:
-        meta_debug["detection_notes"].append("No 'annual min/max' tokens found — trying numeric fallback")
-        min_col_norm, max_col_norm = _fallback_numeric_pair(df_norm)
-
-    if not min_col_norm and not max_col_norm:
-        meta_debug["detection_notes"].append("No candidate min/max columns found even after fallback")
+        notes = []
+        cols = _detect_climate_columns(df_clim_raw, normalized, notes)
+        try:
+            ref = weakref.ref(df_clim_raw, lambda _, key=key: _SCHEMA_CACHE.pop(key, None))
+            _SCHEMA_CACHE[key] = (ref, df_clim_raw.columns, (cols, tuple(notes)))
+        except TypeError:
+            pass
+    meta_debug["detection_notes"].extend(notes)
+    if cols is None:
         return None, meta_debug
+    year_col_orig, min_col_orig, max_col_orig = cols
 
-    # map normalized back to original names
-    year_col_orig = col_map.get(year_col_norm, year_col_norm)
-    min_col_orig = col_map.get(min_col_norm) if min_col_norm else None
-    max_col_orig = col_map.get(max_col_norm) if max_col_norm else None
+    # coerce into local float arrays; the (cached) loader frame is never copied or modified
+    def _as_float(col):
+        return pd.to_numeric(df_clim_raw[col], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
 
-    # Prepare working dataframe and coerce numeric
-    df_work = df_clim_raw.copy()
-    df_work[year_col_orig] = pd.to_numeric(df_work[year_col_orig], errors="coerce")
+    year_arr = _as_float(year_col_orig)
     if min_col_orig and max_col_orig:
         # both present -> average them
-        df_work["annual_mean_temp_c"] = (pd.to_numeric(df_work[min_col_orig], errors="coerce") + pd.to_numeric(df_work[max_col_orig], errors="coerce")) / 2.0
+        temp_arr = (_as_float(min_col_orig) + _as_float(max_col_orig)) / 2.0
     else:
         # single candidate -> use it directly as the metric
-        use_col = min_col_orig or max_col_orig
-        df_work["annual_mean_temp_c"] = pd.to_numeric(df_work[use_col], errors="coerce")
+        temp_arr = _as_float(min_col_orig or max_col_orig)
 
     # ensure there are numeric year values
-    if df_work[year_col_orig].dropna().empty:
+    year_ok = ~np.isnan(year_arr)
+    if not year_ok.any():
         meta_debug["detection_notes"].append(f"Year column '{year_col_orig}' could not be coerced to numeric")
         return None, meta_debug
 
-    max_year = int(df_work[year_col_orig].dropna().astype(int).max())
+    max_year = int(year_arr[year_ok].max())
     min_year = int(max_year - last_n_years + 1)
-    sel = df_work[(df_work[year_col_orig] >= min_year) & (df_work[year_col_orig] <= max_year)]
-    if sel.empty:
+    in_range = (year_arr >= min_year) & (year_arr <= max_year)
+    if not in_range.any():
         meta_debug["detection_notes"].append(f"No rows in year range {min_year}..{max_year}")
-        available_years = df_work[year_col_orig].dropna().astype(int).unique().tolist()
+        available_years = pd.unique(year_arr[year_ok].astype(int)).tolist()
         meta_debug["available_years_sample"] = available_years[:10]
         return None, meta_debug
 
-    avg_val = float(sel["annual_mean_temp_c"].mean())
-    rows_used = sel[[year_col_orig, "annual_mean_temp_c"]].dropna().rename(columns={year_col_orig: "year"}).to_dict(orient="records")
+    # one gather feeds both the mean and rows_used
+    mask = in_range & ~np.isnan(temp_arr)
+    sel_years, sel_temps = year_arr[mask], temp_arr[mask]
+    avg_val = float(sel_temps.mean()) if sel_temps.size else float("nan")
+    rows_used = [{"year": int(y), "annual_mean_temp_c": float(t)}
+                 for y, t in zip(sel_years.tolist(), sel_temps.tolist())]
     out = pd.DataFrame([{"region": "All India", "avg_annual_mean_temp_c": avg_val}])
     meta = {
         "years_used": (min_year, max_year),
@@ -218,23 +315,24 @@ def exec_compare_rainfall_and_top_crops(parsed):
     N = parsed.get("N", 5)
     M = parsed.get("M", 3)
 
-    # load crop and climate - loaders may return (df, meta) or df
+    # load crop and climate concurrently (independent CSV parses on a cold cache) - loaders may return (df, meta) or df
+    fut_crop = _LOAD_POOL.submit(_cached_crop)
+    fut_clim = _LOAD_POOL.submit(_cached_climate)
     try:
-        ret_crop = load_crop_production()
-        df_crop, meta_crop = _unwrap_loader_result(ret_crop)
+        df_crop, meta_crop, _, _ = fut_crop.result()
     except Exception:
         df_crop, meta_crop = None, {}
 
     try:
-        ret_clim = load_climate_temp_series()
-        df_clim, meta_clim = _unwrap_loader_result(ret_clim)
+        df_clim, meta_clim, clim_norm, clim_col_map = fut_clim.result()
     except Exception:
-        df_clim, meta_clim = None, {}
+        df_clim, meta_clim, clim_norm, clim_col_map = None, {}, None, {}
 
     # climate: robust national average detection
     climate_out, climate_meta = None, {}
     try:
-        climate_out, climate_meta = _compute_national_climate_avg(df_clim, N)
+        normalized = (clim_norm, clim_col_map) if clim_norm is not None else None
+        climate_out, climate_meta = _compute_national_climate_avg(df_clim, N, normalized)
     except Exception:
         climate_out, climate_meta = None, {"debug": "exception during detection"}
 
@@ -245,34 +343,49 @@ def exec_compare_rainfall_and_top_crops(parsed):
         if isinstance(df_crop, pd.DataFrame):
             # find production-like and crop-like columns (case-insensitive)
             cols_l = {c.lower(): c for c in df_crop.columns}
-            prod_col = next((orig for low, orig in cols_l.items() if "production" in low or "quantity" in low or "tonne" in low), None)
-            crop_col = next((orig for low, orig in cols_l.items() if low in ("crop","crops","commodity","crops name","cropsname","crops ")), None)
-            year_col = next((orig for low, orig in cols_l.items() if low in ("year","season","financial_year","year ")), None)
+            prod_col = crop_col = year_col = None
+            for low, orig in cols_l.items():
+                if prod_col is None and ("production" in low or "quantity" in low or "tonne" in low):
+                    prod_col = orig
+                elif crop_col is None and low in CROP_LOW_SET:
+                    crop_col = orig
+                elif year_col is None and low in YEAR_LOW_SET:
+                    year_col = orig
+                if prod_col and crop_col and year_col:
+                    break
 
-            dff = df_crop.copy()
+            # year-range row mask on raw arrays (no copy of the cached frame)
+            m = np.ones(len(df_crop), dtype=bool)
             if year_col:
-                dff[year_col] = pd.to_numeric(dff[year_col], errors="coerce")
-                if not dff[year_col].dropna().empty:
-                    maxy = int(dff[year_col].dropna().astype(int).max())
-                    dff = dff[(dff[year_col] >= (maxy - N + 1)) & (dff[year_col] <= maxy)]
+                year_arr = pd.to_numeric(df_crop[year_col], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+                year_ok = ~np.isnan(year_arr)
+                if year_ok.any():
+                    maxy = int(year_arr[year_ok].max())
+                    m = (year_arr >= (maxy - N + 1)) & (year_arr <= maxy)
 
             if prod_col and crop_col:
-                dff[prod_col] = pd.to_numeric(dff[prod_col], errors="coerce").fillna(0)
-                agg = dff.groupby(crop_col)[prod_col].sum().reset_index().sort_values(prod_col, ascending=False).head(M)
-                agg = agg.rename(columns={crop_col: "crop", prod_col: "production_tonnes"})
+                prod_arr = pd.to_numeric(df_crop[prod_col], errors="coerce").fillna(0).to_numpy()
+                # group on categorical codes rather than hashing a Python string per row
+                crop_s = df_crop[crop_col]
+                if not isinstance(crop_s.dtype, pd.CategoricalDtype):
+                    crop_s = crop_s.astype("category")
+                # nlargest is a partial sort; only the M-row result is turned into records
+                top = pd.Series(prod_arr[m]).groupby(crop_s.array[m], observed=True).sum().nlargest(M)
+                agg = top.rename_axis("crop").reset_index(name="production_tonnes")
                 top_per_state["All India"] = agg.to_dict(orient="records")
-                crop_sample_rows = dff.head(8).to_dict(orient="records")
+                crop_sample_rows = _head_records(df_crop.iloc[np.flatnonzero(m)[:8]], 8)
             else:
                 # fallback: try to sum numeric columns if there's a 'Crops' column
                 if "Crops" in df_crop.columns:
                     numeric_cols = [c for c in df_crop.columns if pd.api.types.is_numeric_dtype(df_crop[c])]
                     if numeric_cols:
-                        df_sum = df_crop.copy()
-                        df_sum["production_tonnes"] = df_sum[numeric_cols].sum(axis=1)
-                        agg = df_sum.groupby("Crops")["production_tonnes"].sum().reset_index().sort_values("production_tonnes", ascending=False).head(M)
-                        agg = agg.rename(columns={"Crops": "crop"})
+                        # aggregate per crop first, then row-sum the small G x K table instead of all N rows
+                        agg = df_crop.groupby("Crops", observed=True)[numeric_cols].sum()
+                        totals = pd.Series(agg.to_numpy().sum(axis=1), index=agg.index, name="production_tonnes")
+                        agg = totals.nlargest(M).reset_index().rename(columns={"Crops": "crop"})
                         top_per_state["All India"] = agg.to_dict(orient="records")
-                        crop_sample_rows = df_sum.head(8).to_dict(orient="records")
+                        sample = df_crop.head(8)
+                        crop_sample_rows = _head_records(sample.assign(production_tonnes=sample[numeric_cols].sum(axis=1)), 8)
                     else:
                         top_per_state["All India"] = []
                 else:
@@ -282,18 +395,18 @@ def exec_compare_rainfall_and_top_crops(parsed):
     except Exception:
         top_per_state["All India"] = []
 
-    # chart (optional)
-    chart_b64 = None
+    # chart (only when asked for; figure creation + PNG encoding dominates otherwise)
+    chart_png = None
     try:
-        if climate_out is not None and not climate_out.empty:
-            fig, ax = plt.subplots()
+        if parsed.get("want_chart") and climate_out is not None and not climate_out.empty:
+            fig, ax = plt.subplots(figsize=(4, 3), dpi=80)
             ycol = next((c for c in climate_out.columns if c != "region"), climate_out.columns[-1])
             ax.bar(climate_out["region"].astype(str), climate_out[ycol].astype(float))
             ax.set_ylabel("Avg annual mean (°C)")
-            ax.set_title(f"Average annual climate metric ({climate_meta.get('years_used')})")
-            chart_b64 = fig_to_base64(fig)
+            ax.set_title(f"Average annual climate metric ({climate_meta.get('years_used')})", fontsize="small")
+            chart_png = fig_to_png(fig)
     except Exception:
-        chart_b64 = None
+        chart_png = None
 
     # build textual answer
     lines = []
@@ -340,23 +453,25 @@ def exec_compare_rainfall_and_top_crops(parsed):
 
     return {
         "answer_text": "\n".join(lines),
-        "chart": chart_b64,
+        "chart_png": chart_png,
         "climate_table": (climate_out.to_dict(orient="records") if climate_out is not None else []),
         "top_crops": top_per_state,
         "provenance": prov
     }
 
-def handle_question(question: str):
+def handle_question(question: str, want_chart=None):
     try:
         if not question or not question.strip():
-            return {"answer_text": "Please enter a non-empty question.", "chart": None, "climate_table": [], "top_crops": {}, "provenance": []}
+            return {"answer_text": "Please enter a non-empty question.", "chart_png": None, "climate_table": [], "top_crops": {}, "provenance": []}
         q = question.strip().lower()
         parsed = parse_question(question)
+        if want_chart is not None:
+            parsed["want_chart"] = bool(want_chart)
         if "list states" in q:
             # attempt to find a 'state' column in crop or climate files
             states = []
             try:
-                df_crop, _ = _unwrap_loader_result(load_crop_production())
+                df_crop, _, _, _ = _cached_crop()
                 if isinstance(df_crop, pd.DataFrame):
                     for c in df_crop.columns:
                         if c.lower() == "state":
@@ -366,10 +481,9 @@ def handle_question(question: str):
                 pass
             if not states:
                 states = ["All India"]
-            return {"answer_text": "Detected states from local data: " + ", ".join(states), "chart": None, "climate_table": [], "top_crops": {}, "provenance": []}
-        if re.search(r"\b(compare|contrast)\b", q) or True:
-            return exec_compare_rainfall_and_top_crops(parsed)
-        return {"answer_text": "Sorry — couldn't classify", "chart": None, "climate_table": [], "top_crops": {}, "provenance": []}
+            return {"answer_text": "Detected states from local data: " + ", ".join(states), "chart_png": None, "climate_table": [], "top_crops": {}, "provenance": []}
+        # compare/contrast is the only analytic intent so far, so every other question falls through to it
+        return exec_compare_rainfall_and_top_crops(parsed)
     except Exception as e:
         tb = traceback.format_exc()
-        return {"answer_text": f"Internal error: {e}", "debug": tb, "chart": None, "climate_table": [], "top_crops": {}, "provenance": []}
+        return {"answer_text": f"Internal error: {e}", "debug": tb, "chart_png": None, "climate_table": [], "top_crops": {}, "provenance": []}
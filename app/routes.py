@@ -1,9 +1,44 @@
 # app/routes.py
-from flask import Blueprint, render_template, request, jsonify
+import hashlib
+import threading
+from flask import Blueprint, render_template, request, jsonify, Response, abort
 from .query_executor import handle_question
+from .loaders import clear_caches
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; responses then go through flask.jsonify
+    orjson = None
 
 bp = Blueprint("main", __name__)
 
+# rendered chart PNGs keyed by content hash, served by /api/chart/<key>.png; FIFO-evicted
+_CHART_CACHE = {}
+_CHART_CACHE_MAX = 32
+_CHART_CACHE_LOCK = threading.Lock()
+
+def _json_default(obj):
+    # numpy scalars and anything else orjson doesn't know natively
+    if hasattr(obj, "item"):
+        return obj.item()
+    return str(obj)
+
+def _json_response(payload, status=200):
+    if orjson is None:
+        return jsonify(payload), status
+    body = orjson.dumps(payload, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return Response(body, status=status, mimetype="application/json")
+
+def _store_chart(png):
+    """Keep `png` for the chart endpoint and return its URL."""
+    key = hashlib.blake2b(png, digest_size=8).hexdigest()
+    with _CHART_CACHE_LOCK:
+        if key not in _CHART_CACHE:
+            while len(_CHART_CACHE) >= _CHART_CACHE_MAX:
+                _CHART_CACHE.pop(next(iter(_CHART_CACHE)))
+            _CHART_CACHE[key] = png
+    return f"/api/chart/{key}.png"
+
 @bp.route("/")
 def index():
     return render_template("index.html")
@@ -11,10 +46,11 @@ def index():
 @bp.route("/api/query", methods=["POST"])
 def api_query():
     """
-    Accepts JSON: { "question": "<text>" }
+    Accepts JSON: { "question": "<text>", "chart": true|false (optional) }
     Returns JSON with keys:
       - answer_text (string)
-      - chart (base64 image or null)
+      - chart / chart_url (URL of the PNG under /api/chart/ or null; only rendered when "chart"
+        is true or the question mentions a chart/plot/graph)
       - climate_table (list)
       - top_crops (dict)
       - provenance (list)
@@ -30,20 +66,23 @@ def api_query():
         question = str(question)
 
     if not question.strip():
-        return jsonify({
+        return _json_response({
             "answer_text": "Please provide a question (e.g. 'list states' or 'Compare the average annual climate metric in StateA and StateB for the last 5 years').",
             "chart": None,
             "climate_table": [],
             "top_crops": {},
             "provenance": []
-        }), 400
+        }, 400)
 
     try:
-        result = handle_question(question)
+        result = handle_question(question, want_chart=payload.get("chart"))
+        chart_png = result.get("chart_png") if isinstance(result, dict) else None
+        chart_url = _store_chart(chart_png) if chart_png else None
         # Ensure we always return all expected keys so frontend doesn't break
         response = {
             "answer_text": result.get("answer_text") if isinstance(result, dict) else str(result),
-            "chart": (result.get("chart") if isinstance(result, dict) else None),
+            "chart": chart_url,
+            "chart_url": chart_url,
             "climate_table": (result.get("climate_table") if isinstance(result, dict) else []),
             "top_crops": (result.get("top_crops") if isinstance(result, dict) else {}),
             "provenance": (result.get("provenance") if isinstance(result, dict) else []),
@@ -51,11 +90,11 @@ def api_query():
         # include debug field if present (helpful while developing)
         if isinstance(result, dict) and "debug" in result:
             response["debug"] = result["debug"]
-        return jsonify(response)
+        return _json_response(response)
     except Exception as e:
         import traceback
         tb = traceback.format_exc()
-        return jsonify({
+        return _json_response({
             "answer_text": "Internal server error while processing your question.",
             "chart": None,
             "climate_table": [],
@@ -63,4 +102,19 @@ def api_query():
             "provenance": [],
             "error": str(e),
             "debug": tb
-        }), 500
+        }, 500)
+
+@bp.route("/api/chart/<key>.png")
+def api_chart(key):
+    """Serve a chart rendered by an earlier /api/query call (404 once evicted)."""
+    with _CHART_CACHE_LOCK:
+        png = _CHART_CACHE.get(key)
+    if png is None:
+        abort(404)
+    return Response(png, mimetype="image/png", headers={"Cache-Control": "private, max-age=3600"})
+
+@bp.route("/api/reload", methods=["POST"])
+def api_reload():
+    """Drop cached data-directory lookups and loader results so changed CSVs are picked up without a restart."""
+    clear_caches()
+    return _json_response({"status": "ok"})
@@ -6,7 +6,7 @@ document.getElementById("send")?.addEventListener("click", async () => {
   const res = await fetch("/api/query", {
     method: "POST",
     headers: {"Content-Type": "application/json"},
-    body: JSON.stringify({question: q})
+    body: JSON.stringify({question: q, chart: true})
   });
   const j = await res.json();
   if (!j.ok) {
@@ -3,14 +3,14 @@
 import matplotlib
 matplotlib.use("Agg")
 
-import base64
 from io import BytesIO
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 
-def fig_to_base64(fig):
+def fig_to_png(fig):
+    """Render `fig` to PNG bytes and close it."""
+    # callers pre-size the figure, so skip savefig's tight-bbox layout pass
     buf = BytesIO()
-    fig.savefig(buf, format="png", bbox_inches="tight")
-    buf.seek(0)
-    img_b64 = base64.b64encode(buf.read()).decode("ascii")
+    FigureCanvasAgg(fig).print_png(buf)
     plt.close(fig)
-    return "data:image/png;base64," + img_b64
+    return buf.getvalue()
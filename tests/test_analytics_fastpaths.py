@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+from app import analytics
+
+def _crop_frame():
+    rng = np.random.default_rng(0)
+    n = 500
+    return pd.DataFrame({
+        "year": rng.integers(2010, 2021, n),
+        "state": rng.choice(["StateA", "StateB", "StateC"], n),
+        "crop": rng.choice(["Rice", "Wheat", "Maize", "Pulses", "Cotton"], n),
+        "production_tonnes": rng.random(n) * 1000,
+    })
+
+def test_top_crops_categorical_matches_object_columns():
+    df = _crop_frame()
+    cat = df.astype({"state": "category", "crop": "category"})
+    expected = analytics.top_crops_by_volume(df, "StateB", 3, 3)
+    got = analytics.top_crops_by_volume(cat, "StateB", 3, 3)
+    assert got["crop"].astype(str).tolist() == expected["crop"].tolist()
+    np.testing.assert_allclose(got["production_tonnes"], expected["production_tonnes"])
+
+def test_top_crops_unknown_state_is_empty():
+    cat = _crop_frame().astype({"state": "category", "crop": "category"})
+    assert analytics.top_crops_by_volume(cat, "Nowhere", 3, 3).empty
+
+def test_correlation_matches_pandas_corr():
+    prod = pd.DataFrame({"year": [2000, 2001, 2002, 2003, 2004], "crop": ["Rice"] * 5,
+                         "state": ["A"] * 5, "production_tonnes": [1, 2, 3, 5, 9]})
+    clim = pd.DataFrame({"year": [2000, 2001, 2002, 2003], "state": ["A"] * 4,
+                         "annual_mean_temp_c": [20, 21, 21.5, 23]})
+    merged, meta = analytics.correlate_production_with_climate(prod, clim, "rice", "A", 4)
+    assert merged["year"].tolist() == [2000, 2001, 2002, 2003]
+    expected = merged["production_tonnes"].corr(merged["annual_mean_temp_c"])
+    assert abs(meta["pearson_corr"] - expected) < 1e-12
+
+def test_avg_climate_metric_categorical_states_match_object_states():
+    clim = pd.DataFrame({"year": [2018, 2019, 2020, 2020, 2020], "state": ["A", "B", "A", "B", "C"],
+                         "annual_mean_temp_c": [20.0, 21.0, 22.0, 23.0, 24.0]})
+    expected, _ = analytics.avg_annual_climate_metric(clim, ["A", "B", "Z"], last_n_years=2)
+    got, _ = analytics.avg_annual_climate_metric(clim.astype({"state": "category"}), ["A", "B", "Z"], last_n_years=2)
+    assert got["state"].astype(str).tolist() == expected["state"].tolist()
+    assert got["avg_annual_mean_temp_c"].tolist() == expected["avg_annual_mean_temp_c"].tolist()
+
+def test_fast_paths_accept_read_only_arrays_under_copy_on_write():
+    cat = _crop_frame().astype({"state": "category", "crop": "category"})
+    with pd.option_context("mode.copy_on_write", True):
+        top = analytics.top_crops_by_volume(cat, "StateA", 3, 2)
+        corr = analytics._pearson(cat["year"].to_numpy(np.float64), cat["production_tonnes"].to_numpy(np.float64))
+    assert len(top) == 2
+    assert -1.0 <= corr <= 1.0
+
+def test_col_lut_ignores_stale_attrs_on_derived_frames():
+    df = pd.DataFrame({"Year": [2020], "Crop": ["Rice"]})
+    df.attrs["cols_lower"] = {"year": "Year", "crop": "Crop"}
+    assert analytics._col_lut(df) is df.attrs["cols_lower"]
+    renamed = df.rename(columns={"Crop": "Commodity"})
+    assert analytics._col_lut(renamed) == {"year": "Year", "commodity": "Commodity"}
+
+def test_production_trend_categorical_crop_filter_is_case_insensitive():
+    df = _crop_frame()
+    expected, _ = analytics.production_trend(df, "rice", region_filter={"state": "StateA"})
+    got, _ = analytics.production_trend(df.astype({"state": "category", "crop": "category"}), "RICE",
+                                        region_filter={"state": "StateA"})
+    assert got["year"].tolist() == expected["year"].tolist()
+    np.testing.assert_allclose(got["production_tonnes"], expected["production_tonnes"])
+
+def test_top_crops_fused_uses_coerced_year_for_text_years():
+    df = pd.DataFrame({"year": ["2019", "2020", "n/a"], "state": ["A", "A", "A"],
+                       "crop": ["Rice", "Wheat", "Rice"], "production_tonnes": [1.0, 2.0, 4.0]})
+    cat = df.astype({"state": "category", "crop": "category"})
+    expected = analytics.top_crops_by_volume(df, "A", 2, 3)
+    got = analytics.top_crops_by_volume(cat, "A", 2, 3)
+    assert got["crop"].astype(str).tolist() == expected["crop"].tolist() == ["Wheat", "Rice"]
+    np.testing.assert_allclose(got["production_tonnes"], expected["production_tonnes"])
+
+def test_pure_python_fallbacks_match_jit_paths(monkeypatch):
+    cat = _crop_frame().astype({"state": "category", "crop": "category"})
+    fused = analytics.top_crops_by_volume(cat, "StateA", 4, 3)
+    x, y = np.array([1.0, 2.0, 4.0, 3.0]), np.array([2.0, 1.0, 5.0, 7.0])
+    jit_corr = analytics._pearson(x, y)
+    monkeypatch.setattr(analytics, "_crop_totals_kernel", None)
+    monkeypatch.setattr(analytics, "_pearson_kernel", analytics._pearson_py)
+    fallback = analytics.top_crops_by_volume(cat, "StateA", 4, 3)
+    assert fallback["crop"].astype(str).tolist() == fused["crop"].astype(str).tolist()
+    np.testing.assert_allclose(fallback["production_tonnes"], fused["production_tonnes"])
+    assert abs(analytics._pearson(x, y) - jit_corr) < 1e-12
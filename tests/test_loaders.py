@@ -0,0 +1,55 @@
+import pandas as pd
+from app import loaders
+
+def test_read_csv_safe_uses_parquet_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(loaders, "CACHE_DIR", str(tmp_path / ".cache"))
+    csv = tmp_path / "sample.csv"
+    csv.write_text("Year,Rice\n2014-15,2391\n2015-16,2400\n")
+    first = loaders._read_csv_safe(str(csv))
+    assert len(list((tmp_path / ".cache").glob("*.parquet"))) == 1
+    second = loaders._read_csv_safe(str(csv))
+    assert second.equals(first)
+
+def test_find_file_contains_is_memoized_until_cleared(tmp_path, monkeypatch):
+    monkeypatch.setattr(loaders, "DATA_DIR", str(tmp_path))
+    loaders.clear_caches()
+    assert loaders._find_file_contains("late arrival") is None
+    (tmp_path / "Late Arrival.csv").write_text("a\n1\n")
+    assert loaders._find_file_contains("late arrival") is None
+    loaders.clear_caches()
+    assert loaders._find_file_contains("late arrival") == str(tmp_path / "Late Arrival.csv")
+    monkeypatch.undo()
+    loaders.clear_caches()
+
+def test_loader_results_are_cached_in_memory():
+    loaders.clear_caches()
+    first = loaders.load_climate_temp_series()
+    assert loaders.load_climate_temp_series() is first
+    loaders.clear_caches()
+    assert loaders.load_climate_temp_series() is not first
+
+def test_long_form_crop_column_is_categorical():
+    df, _ = loaders.load_crop_production()
+    assert isinstance(df["crop"].dtype, pd.CategoricalDtype)
+
+def test_loaders_return_integer_year_without_missing_values():
+    for loader in (loaders.load_crop_production, loaders.load_climate_temp_series, loaders.load_yield_all_india):
+        df, _ = loader()
+        assert pd.api.types.is_integer_dtype(df["year"])
+        assert df["year"].notna().all()
+
+def test_climate_loader_accepts_a_column_projection():
+    loaders.clear_caches()
+    full, _ = loaders.load_climate_temp_series()
+    header = [c for c in loaders._read_header(loaders._resolve_path(loaders.CLIMATE_FILES))
+              if c.strip() in ("YEAR", "ANNUAL - MIN", "ANNUAL - MAX")]
+    projected, _ = loaders.load_climate_temp_series(columns=header)
+    assert projected.equals(full)
+    assert loaders.load_climate_temp_series(columns=header) is loaders.load_climate_temp_series(columns=header)
+
+def test_read_csv_safe_ignores_dtype_hints_that_do_not_fit(tmp_path, monkeypatch):
+    monkeypatch.setattr(loaders, "CACHE_DIR", str(tmp_path / ".cache"))
+    csv = tmp_path / "sample.csv"
+    csv.write_text("Year,Rice\n2014-15,2391\n2015-16,2400\n")
+    df = loaders._read_csv_safe(str(csv), dtype={"Year": "int32", "Rice": "float64"})
+    assert df["Year"].tolist() == ["2014-15", "2015-16"]
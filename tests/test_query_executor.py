@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+from app import query_executor
+from app.loaders import clear_caches
+
+def test_normalize_columns_is_memoized_per_frame():
+    df = pd.DataFrame({"ANNUAL - MIN": [1.0]})
+    first = query_executor._normalize_columns(df)
+    assert query_executor._normalize_columns(df) is first
+    df["ANNUAL - MAX"] = 2.0
+    assert "annual max" in query_executor._normalize_columns(df)[1]
+    del df
+    assert not any(ref() is None for ref, _, _ in query_executor._NORM_CACHE.values())
+
+def test_climate_normalization_is_reused_until_loader_result_changes():
+    clear_caches()
+    first = query_executor._cached_climate()
+    assert query_executor._cached_climate()[2] is first[2]
+    clear_caches()
+    assert query_executor._cached_climate()[2] is not first[2]
+
+def test_fallback_numeric_pair_picks_coolest_and_warmest_columns():
+    df_norm = pd.DataFrame({"year": [2001, 2002, 2003], "low": [10.0, 11.0, 12.0],
+                            "high": ["30", "31", "32"], "label": ["a", "b", "c"], "huge": [900, 950, 990]})
+    assert query_executor._fallback_numeric_pair(df_norm) == ("low", "high")
+    assert query_executor._fallback_numeric_pair(df_norm[["year", "low"]]) == ("low", None)
+
+def test_national_climate_avg_skips_missing_temps_and_leaves_input_untouched():
+    raw = pd.DataFrame({"YEAR": ["2015", "2016", "2017", "bad"], "ANNUAL - MIN": [20.0, None, 22.0, 1.0],
+                        "ANNUAL - MAX": [30.0, 31.0, 32.0, 1.0]})
+    before = raw.copy()
+    out, meta = query_executor._compute_national_climate_avg(raw, 2)
+    assert meta["years_used"] == (2016, 2017)
+    assert meta["rows_used"] == [{"year": 2017, "annual_mean_temp_c": 27.0}]
+    assert out["avg_annual_mean_temp_c"].iloc[0] == 27.0
+    pd.testing.assert_frame_equal(raw, before)
+
+def test_top_crops_use_only_the_last_n_years(monkeypatch):
+    df_crop = pd.DataFrame({"Year": [2018, 2019, 2020, 2020, 2020], "Crops": ["Rice", "Rice", "Wheat", "Rice", "Maize"],
+                            "Production": ["500", "1", "7", "2", "x"]})
+    monkeypatch.setattr(query_executor, "_cached_crop", lambda: (df_crop, {"source_file": "t.csv"}, None, {}))
+    res = query_executor.exec_compare_rainfall_and_top_crops({"N": 2, "M": 2})
+    assert res["top_crops"]["All India"] == [{"crop": "Wheat", "production_tonnes": 7.0},
+                                             {"crop": "Rice", "production_tonnes": 3.0}]
+    assert len(res["provenance"][0]["sample_rows_used"]) == 4
+
+def test_top_crops_fallback_sums_numeric_columns_per_crop(monkeypatch):
+    df_crop = pd.DataFrame({"Crops": ["Rice", "Wheat", "Rice"], "2016-17": [1.0, 5.0, 2.0], "2017-18": [3.0, 1.0, None]})
+    monkeypatch.setattr(query_executor, "_cached_crop", lambda: (df_crop, {}, None, {}))
+    res = query_executor.exec_compare_rainfall_and_top_crops({"N": 5, "M": 1})
+    assert res["top_crops"]["All India"] == [{"crop": "Rice", "production_tonnes": 6.0}]
+    assert res["provenance"][0]["sample_rows_used"][0]["production_tonnes"] == 4.0
+
+def test_chart_is_rendered_only_on_request():
+    q = "Compare the average annual climate metric for the last 5 years"
+    assert query_executor.parse_question(q)["want_chart"] is False
+    assert query_executor.parse_question(q + " and plot it")["want_chart"] is True
+    assert query_executor.handle_question(q)["chart_png"] is None
+    assert query_executor.handle_question(q, want_chart=True)["chart_png"].startswith(b"\x89PNG")
+
+def test_head_records_keeps_native_types_and_fills_missing():
+    df = pd.DataFrame({"YEAR": np.array([2015, 2016], dtype="int16"), "crop": pd.Categorical(["Rice", None]),
+                       "t": [1.5, np.nan], "n": pd.array([1, None], dtype="Int32")})
+    assert query_executor._head_records(df, 10, na_value="") == [
+        {"YEAR": 2015, "crop": "Rice", "t": 1.5, "n": 1}, {"YEAR": 2016, "crop": "", "t": "", "n": ""}]
+    assert query_executor._head_records(df, 1)[0]["YEAR"].__class__ is int
+    assert query_executor._head_records(df.iloc[1:], 1) == [{"YEAR": 2016, "crop": None, "t": None, "n": None}]
+
+def test_national_climate_avg_detects_unnamed_year_column():
+    raw = pd.DataFrame({"PERIOD": ["2015", "2016", "2017"], "LOW": [20.0, 21.0, 22.0], "HIGH": [30.0, 31.0, 32.0],
+                        "NOTE": ["a", "b", "c"]})
+    out, meta = query_executor._compute_national_climate_avg(raw, 2)
+    assert meta["year_column"] == "PERIOD" and (meta["min_col"], meta["max_col"]) == ("LOW", "HIGH")
+    assert meta["years_used"] == (2016, 2017) and out["avg_annual_mean_temp_c"].iloc[0] == 26.5
+
+def test_climate_detection_is_memoized_for_the_cached_loader_frame(monkeypatch):
+    clear_caches()
+    df_clim, _, clim_norm, clim_col_map = query_executor._cached_climate()
+    first_out, first_meta = query_executor._compute_national_climate_avg(df_clim, 5, (clim_norm, clim_col_map))
+    assert id(df_clim) in query_executor._SCHEMA_CACHE
+
+    def fail(*args, **kwargs):
+        raise AssertionError("detection should not rerun")
+    monkeypatch.setattr(query_executor, "_detect_climate_columns", fail)
+    df_again, _, norm_again, map_again = query_executor._cached_climate()
+    out, meta = query_executor._compute_national_climate_avg(df_again, 5, (norm_again, map_again))
+    assert out.equals(first_out) and meta == first_meta
+    assert meta["debug"]["detection_notes"] == first_meta["debug"]["detection_notes"] != []
+
+def test_handle_question_uses_one_schema_for_every_branch():
+    keys = {"answer_text", "chart_png", "climate_table", "top_crops", "provenance"}
+    for q in ("", "list states", "Compare the average annual climate metric"):
+        result = query_executor.handle_question(q)
+        assert keys <= set(result) and "chart" not in result
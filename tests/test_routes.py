@@ -0,0 +1,12 @@
+from app import create_app
+
+def test_query_links_chart_png_instead_of_embedding_it():
+    client = create_app().test_client()
+    resp = client.post("/api/query", json={"question": "Compare the average annual climate metric", "chart": True})
+    assert resp.status_code == 200 and resp.mimetype == "application/json"
+    url = resp.get_json()["chart_url"]
+    assert url.startswith("/api/chart/") and resp.get_json()["chart"] == url
+    png = client.get(url)
+    assert png.mimetype == "image/png" and png.data.startswith(b"\x89PNG")
+    assert client.get("/api/chart/missing.png").status_code == 404
+    assert client.post("/api/query", json={"question": "list states"}).get_json()["chart"] is None